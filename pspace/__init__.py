@@ -1,6 +1,6 @@
 from .pspace import (
         jobs_create, jobs_list,
-        get_artifacts, save_log,
+        get_artifacts, save_log, save_log_batch,
         get_job_info,
         stop_job,
         save_last_info,
@@ -10,6 +10,7 @@ command-line utility for starting/monitoring paperspace jobs
 
 
 import argparse
+import datetime
 import pathlib
 import sys
 
@@ -18,25 +19,19 @@ import pspace
 
 VALID_JOB_STATES = ['Pending', 'Provisioned', 'Running', 'Stopped',
         'Error', 'Failed', 'Cancelled']
-
-def process_command_line(argv):
-    """Process command line invocation arguments and switches.
-
-    Args:
-        argv: list of arguments, or `None` from ``sys.argv[1:]``.
-
-    Returns:
-        argparse.Namespace: named attributes of arguments and switches
-    """
-    #script_name = argv[0]
-    argv = argv[1:]
-
-    # initialize the parser object:
-    parser = argparse.ArgumentParser(
-            description="Utilities for creating and monitoring paperspace jobs.")
-    subparsers = parser.add_subparsers(dest='pspace_cmd', help='sub-command help')
-
-    # create
+# every lowercase prefix of every job state, mapped to the full state name
+#   (earlier states in VALID_JOB_STATES win, e.g. 'p' -> 'Pending')
+JOB_STATE_PREFIXES = {
+        state[:i].lower(): state
+        for state in reversed(VALID_JOB_STATES)
+        for i in range(1, len(state) + 1)
+        }
+# job_info keys to print for each job in status and jobs
+STATUS_PRINT_KEYS = ('state', 'Started', 'Finished', 'Duration', 'exitCode')
+JOBS_PRINT_KEYS = ('name', 'state', 'entrypoint', 'project', 'Started',
+        'Finished', 'exitCode', 'machineType',)
+
+def _build_create(subparsers):
     create_desc = 'create a new job'
     parser_create = subparsers.add_parser(
             'create', help=create_desc, description=create_desc
@@ -62,6 +57,8 @@ def process_command_line(argv):
             help='A list of commands to execute on remote machine.'
             )
 
+
+def _build_tail(subparsers):
     # tail (of job log file)
     tail_desc = 'get the tail of a job\'s log'
     parser_tail = subparsers.add_parser(
@@ -80,7 +77,8 @@ def process_command_line(argv):
             help='How many lines at the end of the log (or "all") (default: 20)'
             )
 
-    # jobs
+
+def _build_jobs(subparsers):
     jobs_desc = 'list jobs'
     parser_jobs = subparsers.add_parser(
             'jobs', help=jobs_desc, description=jobs_desc
@@ -102,7 +100,8 @@ def process_command_line(argv):
             help='Display all times as UTC.'
             )
 
-    # status
+
+def _build_status(subparsers):
     status_desc = 'get a job\'s status'
     parser_status = subparsers.add_parser(
             'status', help=status_desc, description=status_desc
@@ -116,21 +115,23 @@ def process_command_line(argv):
             help='Display all times as UTC.'
             )
 
-    # getart
+
+def _build_getart(subparsers):
     getart_desc = 'download artifact files from a job'
     parser_getart = subparsers.add_parser(
             'getart', help=getart_desc, description=getart_desc
             )
     parser_getart.add_argument(
-            'job_id', nargs='?',
-            help='ID of job to fetch artifacts for.'
+            'job_id', nargs='*',
+            help='ID(s) of job(s) to fetch artifacts for.'
             )
     parser_getart.add_argument(
             '--destdir', action='store',
             help='Local data directory to put job data dir. (default: data)'
             )
 
-    # stop
+
+def _build_stop(subparsers):
     stop_desc = 'stop or cancel a job'
     parser_stop = subparsers.add_parser(
             'stop', help=stop_desc, description=stop_desc
@@ -140,12 +141,65 @@ def process_command_line(argv):
             help='ID of job to stop.'
             )
 
-    # newyaml
+
+def _build_newyaml(subparsers):
     newyaml_desc = 'create new yaml config file from defaults'
-    parser_stop = subparsers.add_parser(
+    subparsers.add_parser(
             'newyaml', help=newyaml_desc, description=newyaml_desc
             )
 
+
+# order here is the order sub-commands are listed in help
+_SUBCMD_BUILDERS = {
+        'create': _build_create,
+        'tail': _build_tail,
+        'jobs': _build_jobs,
+        'status': _build_status,
+        'getart': _build_getart,
+        'stop': _build_stop,
+        'newyaml': _build_newyaml,
+        }
+
+
+def _sniff_subcommand(argv):
+    """Return the sub-command named in argv, or None if help was requested
+        or no valid sub-command is first.
+    """
+    if '-h' in argv or '--help' in argv:
+        return None
+    if argv and argv[0] in _SUBCMD_BUILDERS:
+        return argv[0]
+    return None
+
+
+def process_command_line(argv):
+    """Process command line invocation arguments and switches.
+
+    Only the sub-parser for the requested sub-command is built, unless help
+    was asked for or the sub-command is not recognized, in which case all
+    of them are built so argparse can show full help or error messages.
+
+    Args:
+        argv: list of arguments, or `None` from ``sys.argv[1:]``.
+
+    Returns:
+        argparse.Namespace: named attributes of arguments and switches
+    """
+    #script_name = argv[0]
+    argv = argv[1:]
+
+    # initialize the parser object:
+    parser = argparse.ArgumentParser(
+            description="Utilities for creating and monitoring paperspace jobs.")
+    subparsers = parser.add_subparsers(dest='pspace_cmd', help='sub-command help')
+
+    subcmd = _sniff_subcommand(argv)
+    if subcmd is not None:
+        _SUBCMD_BUILDERS[subcmd](subparsers)
+    else:
+        for build_subparser in _SUBCMD_BUILDERS.values():
+            build_subparser(subparsers)
+
     args = parser.parse_args(argv)
 
     return args
@@ -171,8 +225,7 @@ def command_status(args):
 
     pspace.save_last_info(job_info)
 
-    print_keys = ['state', 'Started', 'Finished', 'Duration', 'exitCode']
-    pspace.print_job_status(job_info, print_keys, utc_str=cmd_config['utc'])
+    pspace.print_job_status(job_info, STATUS_PRINT_KEYS, utc_str=cmd_config['utc'])
 
 
 def command_jobs(args):
@@ -181,9 +234,9 @@ def command_jobs(args):
     if cmd_config['state'] is not None:
         # match any state argument case-insensitively, only first chars are
         #   needed
-        state = cmd_config['state'][0].upper() + cmd_config['state'][1:]
-        matching_state = [x for x in VALID_JOB_STATES if x.startswith(state)][0]
-        cmd_config['state'] = matching_state
+        cmd_config['state'] = JOB_STATE_PREFIXES.get(
+                cmd_config['state'].lower(), cmd_config['state']
+                )
 
     list_kwargs = cmd_config.copy()
     list_kwargs.pop('last')
@@ -192,13 +245,15 @@ def command_jobs(args):
     if cmd_config['last'] is not None:
         job_list = job_list[-cmd_config['last']:]
 
-    print_keys = ['name', 'state', 'entrypoint', 'project', 'Started',
-            'Finished', 'exitCode', 'machineType',]
+    # one "now" for every running job's duration
+    now_utc = datetime.datetime.now(tz=datetime.timezone.utc)
     first = True
     for job in job_list:
         if not first:
             print("")
-        pspace.print_job_status(job, print_keys, utc_str=cmd_config['utc'])
+        pspace.print_job_status(
+                job, JOBS_PRINT_KEYS, utc_str=cmd_config['utc'], now_utc=now_utc
+                )
         first = False
 
 
@@ -260,12 +315,24 @@ def command_create(args):
 
 
 def command_getart(args):
+    # no job_id arguments gives [], make it None so the last job_id is used
+    if not args.job_id:
+        args.job_id = None
     cmd_config = pspace.get_cmd_config(args)
 
-    print("Retrieving artifacts for job " + cmd_config['job_id'] + " ...")
-    pspace.get_artifacts(cmd_config['job_id'], cmd_config['destdir'])
+    job_ids = cmd_config['job_id']
+    if job_ids is None:
+        print("Cannot determine job id.")
+        return
+    if isinstance(job_ids, str):
+        job_ids = [job_ids]
+
+    # artifactsGet output doesn't say which job it is for, so one at a time
+    for job_id in job_ids:
+        print("Retrieving artifacts for job " + job_id + " ...")
+        pspace.get_artifacts(job_id, cmd_config['destdir'])
     # TODO 20190422: error handling
-    pspace.save_log(cmd_config['job_id'], cmd_config['destdir'])
+    pspace.save_log_batch(job_ids, cmd_config['destdir'])
 
 
 def command_stop(args):
@@ -279,23 +346,23 @@ def command_stop(args):
         pspace.print_error(returnval)
 
 
+_SUBCMD_FUNCTIONS = {
+        'create': command_create,
+        'tail': command_tail,
+        'status': command_status,
+        'jobs': command_jobs,
+        'getart': command_getart,
+        'stop': command_stop,
+        'newyaml': command_newyaml,
+        }
+
+
 def main(argv=None):
     args = process_command_line(argv)
 
-    if args.pspace_cmd == 'create':
-        command_create(args)
-    elif args.pspace_cmd == 'tail':
-        command_tail(args)
-    elif args.pspace_cmd == 'status':
-        command_status(args)
-    elif args.pspace_cmd == 'jobs':
-        command_jobs(args)
-    elif args.pspace_cmd == 'getart':
-        command_getart(args)
-    elif args.pspace_cmd == 'stop':
-        command_stop(args)
-    elif args.pspace_cmd == 'newyaml':
-        command_newyaml(args)
+    command_function = _SUBCMD_FUNCTIONS.get(args.pspace_cmd)
+    if command_function is not None:
+        command_function(args)
 
     return 0
 
@@ -4,13 +4,19 @@
 """
 
 
-import copy
+import collections
 import datetime
+import functools
+import json
+import os
 import pathlib
+import random
+import shutil
+import tempfile
 import time
 
-import yaml
-import paperspace
+# yaml and paperspace are slow to import, so they are imported inside the
+#   functions that use them to keep CLI startup (e.g. --help) fast.
 
 
 PSPACE_INFO_DIR = '.pspace'
@@ -20,6 +26,15 @@ YAML_CONFIG_SEARCH_PATHS_LOCAL = [
         ]
 PSPACE_CONFIG_FILE = 'pspace.yaml'
 PSPACE_LASTINFO_FILE = 'last_cmd_info.yaml'
+PSPACE_INFO_PATH = pathlib.Path(PSPACE_INFO_DIR)
+PSPACE_LASTINFO_PATH = PSPACE_INFO_PATH / PSPACE_LASTINFO_FILE
+YAML_CONFIG_FILE_PATHS = [
+        dir_path / PSPACE_CONFIG_FILE for dir_path in YAML_CONFIG_SEARCH_PATHS_LOCAL
+        ]
+# parsed yaml files are cached as <PSPACE_INFO_DIR>/<yaml filename><suffix>
+YAML_CACHE_SUFFIX = '.cache.json'
+# only keys of job_info that later commands read back from PSPACE_LASTINFO_FILE
+LASTINFO_JOB_KEYS = ['id',]
 # Any default not listed here will show up as None
 #   value is [<actual command default>, <newyaml init default>
 CMD_ARG_DEFAULTS = {
@@ -47,6 +62,39 @@ CMD_ARG_DEFAULTS = {
             'utc': [False, False],
             }
         }
+# just the actual command defaults from CMD_ARG_DEFAULTS, for get_cmd_config
+CMD_ARG_RUN_DEFAULTS = {
+        cmd: {argkey: arg_defaults[0] for (argkey, arg_defaults) in cmd_defaults.items()}
+        for (cmd, cmd_defaults) in CMD_ARG_DEFAULTS.items()
+        }
+# how many jobs' logs to download at once (artifacts are one job at a time,
+#   paperspace.jobs.artifactsGet isn't safe to run concurrently)
+JOB_FETCH_THREADS = 4
+# follow_log/follow_job_state poll quickly while things are changing, and
+#   back off gradually to the max interval while nothing changes, plus up to
+#   FOLLOW_POLL_JITTER_SEC random extra.  Setting the environment variable
+#   PSPACE_POLL_INTERVAL to a number of seconds (min 1) polls at that fixed
+#   rate instead.
+FOLLOW_POLL_MIN_SEC = 1.0
+FOLLOW_POLL_MAX_SEC = 10.0
+FOLLOW_POLL_BACKOFF = 1.5
+FOLLOW_POLL_JITTER_SEC = 0.25
+PSPACE_POLL_ENV_VAR = 'PSPACE_POLL_INTERVAL'
+FOLLOW_STATE_POLL_SEC = 10.0
+# follow_log stops this long after the job is done even if PSEOF never shows
+FOLLOW_DONE_WAIT_SEC = 20.0
+# job_info keys update_job_info adds or reformats
+UPDATE_JOB_INFO_KEYS = ('Started', 'Finished', 'Duration', 'entrypoint')
+UTC = datetime.timezone.utc
+# how datetimes are shown to the user
+DT_DISPLAY_FORMAT_UTC = "%Y-%m-%d %I:%M:%S%p UTC"
+DT_DISPLAY_FORMAT_LOCAL = "%Y-%m-%d %I:%M:%S%p %Z"
+# get_job_info reuses a response for the same job newer than this
+JOB_INFO_TTL_SEC = 2.0
+# job_id: (time.monotonic() when fetched, job_info)
+JOB_INFO_CACHE = {}
+# directories already created by make_dirs in this process
+MADE_DIRS = set()
 
 
 # all datetimes start with dt in job_info (e.g. dtCreated, dtFinished, etc.)
@@ -65,28 +113,83 @@ CMD_ARG_DEFAULTS = {
 #   Pending -> Provisioned -> Running -> Stopped
 #                                    \-> Failed
 #   other exits at any time: Error, Cancelled
+JOB_NOT_STARTED_STATES = frozenset(['Pending', 'Provisioned'])
+JOB_DONE_STATES = frozenset(['Stopped', 'Cancelled', 'Failed', 'Error'])
 
 
 # pspace helpers -------------------------------------------------------------
 
+def make_dirs(dir_path):
+    """Create dir_path (and parents) if needed, only touching the filesystem
+        the first time a given path is asked for in this process.
+
+    Returns:
+        pathlib.Path: dir_path
+    """
+    dir_path = pathlib.Path(dir_path)
+    if dir_path not in MADE_DIRS:
+        dir_path.mkdir(parents=True, exist_ok=True)
+        MADE_DIRS.add(dir_path)
+    return dir_path
+
+
+def write_file_atomic(file_path, text, backup_path=None):
+    """Write text to file_path via a temp file and os.replace, so nothing
+        ever reads a partly written (or missing) file.
+
+    Args:
+        file_path (pathlib.Path or str): file to write
+        text (str): new contents of file
+        backup_path (pathlib.Path or str): if given, an existing file_path is
+            copied here before the new one replaces it
+    """
+    file_path = pathlib.Path(file_path)
+    # unique temp name, so two pspace processes writing the same file at
+    #   once don't use each other's temp file
+    (tmp_fd, tmp_name) = tempfile.mkstemp(
+            dir=str(file_path.parent), prefix=file_path.name + '.', suffix='.tmp'
+            )
+    try:
+        with os.fdopen(tmp_fd, 'w') as tmp_fh:
+            tmp_fh.write(text)
+        # mkstemp makes the file 0600, give it normal new-file permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_name, 0o666 & ~umask)
+        if backup_path is not None and file_path.exists():
+            shutil.copy2(str(file_path), str(backup_path))
+        os.replace(tmp_name, str(file_path))
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
 # TODO 20190422: can use naive dt_utc return value, may be simpler for other code
 def parse_jobinfo_dt(dt_in_str, utc_str=False):
     """From dt string from job_info, return datetime in UTC
     """
-    dt = datetime.datetime.strptime(
-                dt_in_str[:-5], "%Y-%m-%dT%H:%M:%S"
-                )
-    dt_utc = dt.replace(tzinfo=datetime.timezone.utc)
+    # fixed format "YYYY-MM-DDTHH:MM:SS.fffZ", slicing is much faster than
+    #   strptime
+    dt_utc = datetime.datetime(
+            int(dt_in_str[0:4]), int(dt_in_str[5:7]), int(dt_in_str[8:10]),
+            int(dt_in_str[11:13]), int(dt_in_str[14:16]), int(dt_in_str[17:19]),
+            tzinfo=UTC
+            )
 
     if utc_str:
-        dt_out_str = dt_utc.strftime("%Y-%m-%d %I:%M:%S%p") + " UTC"
+        dt_out_str = dt_utc.strftime(DT_DISPLAY_FORMAT_UTC)
     else:
-        dt_local = dt_utc.astimezone()
-        dt_out_str = dt_local.strftime("%Y-%m-%d %I:%M:%S%p") + " " + dt_local.tzname()
+        # astimezone() per datetime (not a cached local tz) so the offset and
+        #   name are right on both sides of a DST change
+        dt_out_str = dt_utc.astimezone().strftime(DT_DISPLAY_FORMAT_LOCAL)
 
     return (dt_utc, dt_out_str)
 
 
+@functools.lru_cache(maxsize=128)
 def wrap_command_str(in_str, max_width, indent):
     """Commands ending with semicolon are split with a carriage return after
         semicolon.  Each command is split as necessary to not overrun the end
@@ -100,36 +203,39 @@ def wrap_command_str(in_str, max_width, indent):
     for command in command_list:
         # wrap command list in a good way for commands (split at start of switch)
         command_part_list = command.split(' -')
+        part_lens = [len(x) for x in command_part_list]
         # after splitting, join as many pieces together that will fit on line
+        #   (at least one per line), keeping a running length of the line
+        #   instead of re-joining to measure it
         new_command_part_list = []
         in_start = 0
         while in_start < len(command_part_list):
             in_end = in_start + 1
-            while in_end <= len(command_part_list):
-                if len(' -'.join(command_part_list[in_start:in_end])) < max_width:
-                    in_end += 1
-                else:
-                    in_end -= 1
-                    in_end = max(in_start + 1, in_end)
-                    break
+            line_len = part_lens[in_start]
+            while (in_end < len(command_part_list)
+                    and line_len + 2 + part_lens[in_end] < max_width):
+                line_len += 2 + part_lens[in_end]
+                in_end += 1
             new_command_part_list.append(' -'.join(command_part_list[in_start:in_end]))
             in_start = in_end
         new_command_list.append(new_command_part_list)
 
-    command_str = ""
+    command_pad = " "*(indent-1)
+    option_pad = " "*indent + "-"
+    command_lines = []
     all_commands_start = True
     for command_parts in new_command_list:
         command_start = True
         for command_substr in command_parts:
             if all_commands_start:
-                command_str += command_substr + "\n"
+                command_lines.append(command_substr)
                 all_commands_start = False
             elif command_start:
-                command_str += " "*(indent-1) + command_substr + "\n"
+                command_lines.append(command_pad + command_substr)
                 command_start = False
             else:
-                command_str += " "*indent + "-" + command_substr + "\n"
-    return command_str.rstrip()
+                command_lines.append(option_pad + command_substr)
+    return "\n".join(command_lines).rstrip()
 
 
 def print_create_options(create_options):
@@ -142,6 +248,7 @@ def print_create_options(create_options):
     cmd = "; ".join(create_options['commands'])
     command_str = wrap_command_str(cmd, 79, indent)
 
+    out_lines = []
     for opt in sorted(create_options):
         if opt == 'commands':
             opt_value = command_str
@@ -149,7 +256,9 @@ def print_create_options(create_options):
             opt_value = create_options[opt]
 
         if create_options[opt] is not None:
-            print(indent_str + opt + ": " + str(opt_value))
+            out_lines.append(indent_str + opt + ": " + str(opt_value))
+    if out_lines:
+        print("\n".join(out_lines))
 
 
 def get_cmd_config(args, extra_keys=None):
@@ -171,48 +280,62 @@ def get_cmd_config(args, extra_keys=None):
             'last_job_id': ('pspace_info', 'last_job_id'),
             }
 
-    args_dict = vars(args)
+    # copy so args is left intact and get_cmd_config can be called again
+    args_dict = dict(vars(args))
     cmd = args_dict.pop('pspace_cmd')
     yaml_config = get_yaml_config(cmd)
-    pspace_last = get_last_info()
-    cmd_config = {}
-    for argkey in list(args_dict.keys()) + extra_keys:
-        # Default to CMD_ARG_DEFAULTS value or None
-        # first item in dict value list is for newyaml
-        cmd_config[argkey] = CMD_ARG_DEFAULTS.get(cmd, {}).get(argkey, [None])[0]
-
-        # last command
-        if argkey in args_to_pspacelast:
-            (psection, pkey) = args_to_pspacelast[argkey]
-            try:
-                cmd_config[argkey] = pspace_last[psection][pkey]
-            except KeyError:
-                pass
-
-        # YAML
-        if argkey in yaml_config:
-            cmd_config[argkey] = yaml_config[argkey]
-
-        # command arguments
-        if argkey in args_dict:
-            if args_dict[argkey] is not None:
-                cmd_config[argkey] = args_dict[argkey]
+    pspace_last = get_last_info() or {}
+
+    cmd_defaults = CMD_ARG_RUN_DEFAULTS.get(cmd, {})
+    last_config = {}
+    for (argkey, (psection, pkey)) in args_to_pspacelast.items():
+        psection_info = pspace_last.get(psection, {})
+        if pkey in psection_info:
+            last_config[argkey] = psection_info[pkey]
+    args_config = {
+            argkey:arg_value for (argkey, arg_value) in args_dict.items()
+            if arg_value is not None
+            }
+
+    # lookups search these in order, anything not found is None
+    config_chain = collections.ChainMap(
+            args_config, yaml_config, last_config, cmd_defaults
+            )
+    cmd_config = {
+            argkey:config_chain.get(argkey, None)
+            for argkey in list(args_dict.keys()) + extra_keys
+            }
 
     return cmd_config
 
 
-def update_job_info(job_info, later_indent, utc_str=False):
+def update_job_info(job_info, later_indent, utc_str=False, now_utc=None,
+        print_keys=None):
     """Format job_info values and add new derived ones.
+        now_utc lets a caller formatting many jobs share one "now".
+        If print_keys is given, derived values not in it are skipped.
     """
-    if job_info.get('dtStarted', None) is not None:
+    if print_keys is None:
+        print_keys = UPDATE_JOB_INFO_KEYS
+    show_duration = 'Duration' in print_keys
+
+    started_utc = None
+    finished_utc = None
+    if (job_info.get('dtStarted', None) is not None
+            and (show_duration or 'Started' in print_keys)):
         (started_utc, job_info['Started']) = parse_jobinfo_dt(job_info['dtStarted'], utc_str=utc_str)
-    if job_info.get('dtFinished', None) is not None:
+    if (job_info.get('dtFinished', None) is not None
+            and (show_duration or 'Finished' in print_keys)):
         (finished_utc, job_info['Finished']) = parse_jobinfo_dt(job_info['dtFinished'], utc_str=utc_str)
-    if 'Started' in job_info and 'Finished' in job_info:
-        job_info['Duration'] = str(finished_utc - started_utc)
-    elif job_info['state'] in ['Running',]:
-        job_info['Duration'] = str(datetime.datetime.now(tz=datetime.timezone.utc) - started_utc) + " (to now)"
-    job_info['entrypoint'] = wrap_command_str(job_info['entrypoint'], 79, later_indent)
+    if show_duration and started_utc is not None:
+        if finished_utc is not None:
+            job_info['Duration'] = str(finished_utc - started_utc)
+        elif job_info['state'] in ['Running',]:
+            if now_utc is None:
+                now_utc = datetime.datetime.now(tz=UTC)
+            job_info['Duration'] = str(now_utc - started_utc) + " (to now)"
+    if 'entrypoint' in print_keys:
+        job_info['entrypoint'] = wrap_command_str(job_info['entrypoint'], 79, later_indent)
 
     return job_info
 
@@ -223,8 +346,24 @@ def print_error(job_info):
 
 
 def get_job_info(job_id):
-    job_info = paperspace.jobs.show({'jobId': job_id})
-    return job_info
+    """Return job_info for job_id, reusing the last response if it is less
+        than JOB_INFO_TTL_SEC old.  Returns a copy, so callers can modify it.
+    """
+    now = time.monotonic()
+    (fetched, job_info) = JOB_INFO_CACHE.get(job_id, (None, None))
+    if fetched is None or now - fetched >= JOB_INFO_TTL_SEC:
+        import paperspace
+        job_info = paperspace.jobs.show({'jobId': job_id})
+        if 'error' in job_info:
+            return job_info
+        JOB_INFO_CACHE[job_id] = (now, job_info)
+    return dict(job_info)
+
+
+def invalidate_job_info(job_id):
+    """Make the next get_job_info(job_id) ask paperspace again.
+    """
+    JOB_INFO_CACHE.pop(job_id, None)
 
 
 # job status helpers ----------------------------------------------------------
@@ -237,8 +376,8 @@ def job_not_started(job_id, job_info=None):
         bool: True if job has finished (and will not be running in future)
     """
     if job_info is None:
-        job_info = paperspace.jobs.show({'jobId': job_id})
-    return job_info['state'] in ['Pending', 'Provisioned']
+        job_info = get_job_info(job_id)
+    return job_info['state'] in JOB_NOT_STARTED_STATES
 
 
 def job_started(job_id, job_info=None):
@@ -255,23 +394,38 @@ def job_done(job_id, job_info=None):
         bool: True if job has finished (and will not be running in future)
     """
     if job_info is None:
-        job_info = paperspace.jobs.show({'jobId': job_id})
-    return job_info['state'] in ['Stopped', 'Cancelled', 'Failed', 'Error']
+        job_info = get_job_info(job_id)
+    return job_info['state'] in JOB_DONE_STATES
 
 
 # pspace main api ------------------------------------------------------------
 
-def print_job_status(job_info, print_keys, utc_str=False):
-    max_key_len = max([len(x) for x in print_keys])
-    job_info = update_job_info(job_info, later_indent=max_key_len+6, utc_str=utc_str)
+@functools.lru_cache(maxsize=8)
+def _job_status_labels(print_keys):
+    # label for each key in print_keys, all padded to the longest key
+    max_key_len = max(len(x) for x in print_keys)
+    key_labels = tuple(
+            " "*3 + key + " "*(max_key_len - len(key)) + ": " for key in print_keys
+            )
+    return (max_key_len, key_labels)
+
+
+def print_job_status(job_info, print_keys, utc_str=False, now_utc=None):
+    print_keys = tuple(print_keys)
+    (max_key_len, key_labels) = _job_status_labels(print_keys)
+    job_info = update_job_info(
+            job_info, later_indent=max_key_len+6, utc_str=utc_str, now_utc=now_utc,
+            print_keys=print_keys
+            )
 
-    print(job_info['id'])
-    for key in print_keys:
-        post_key = " "*(max_key_len - len(key))
-        print(" "*3 + key + post_key + ": " + str(job_info.get(key, '')))
+    out_lines = [job_info['id']]
+    for (key, key_label) in zip(print_keys, key_labels):
+        out_lines.append(key_label + str(job_info.get(key, '')))
+    print("\n".join(out_lines))
 
 
 def jobs_create(**kwargs):
+    import paperspace
     params = kwargs.copy()
     if 'project' not in params or params['project'] is None:
         params['project'] = pathlib.Path.cwd().name
@@ -288,6 +442,7 @@ def jobs_create(**kwargs):
 def jobs_list(**kwargs):
     """Return all running jobs
     """
+    import paperspace
     jobs_list = paperspace.jobs.list(kwargs)
 
     return jobs_list
@@ -296,84 +451,147 @@ def jobs_list(**kwargs):
 def get_artifacts(job_id, local_data_dir):
     """Put artifact files/dirs in local_data_dir / job_id
     """
+    import paperspace
     # TODO 20190422: maybe make this command quiet and make our own progress?
-    local_data_path = pathlib.Path(local_data_dir)
-    local_data_path.mkdir(parents=True, exist_ok=True)
+    # each job gets its own dir, which is also where save_log puts log.txt
+    local_data_path = make_dirs(pathlib.Path(local_data_dir) / job_id)
     params = {
             'jobId': job_id,
             'dest': str(local_data_path),
             }
     paperspace.jobs.artifactsGet(params)
-    # make 0-byte-size file with jobid
-    (local_data_path / job_id).open('w').close()
 
 
 def stop_job(job_id):
+    import paperspace
     return paperspace.jobs.stop({'jobId':job_id})
 
 # job log stuff ----------------------------------------------------------------
 
-def get_log_lines(job_id, line_start=0):
+def iter_log_pages(job_id, line_start=0):
+    """Yield the job's log, starting at line_start, as lists of lines, one
+        list per (non-empty) response from paperspace.jobs.logs.
+    """
+    import paperspace
+
     # Keep asking for more log lines until we receive none, in case we hit
     #   max number of lines that paperspace.jobs.logs will return at once
-    #   (default 2000).
-    more_log_lines = True
-    log_output = []
-    while more_log_lines:
+    #   (default 2000).  (The SDK already pages internally, so usually the
+    #   first call returns the rest of the log.)
+    while True:
         params = {'jobId': job_id, 'line': line_start}
-        new_log_output = paperspace.jobs.logs(params, no_logging=True)
-        log_output.extend(new_log_output)
-        more_log_lines = bool(new_log_output)
-        line_start += len(new_log_output)
-    # log_output is list of dicts, each dict:
-    #   {
-    #       'line':<int, line number>
-    #       'timestamp':<str, time in UTC>,
-    #       'message':<str, line of log output>,
-    #   }
-    # TODO 20190422: some of that info might be useful, return it?
-    return [x['message'] for x in log_output]
+        log_page = paperspace.jobs.logs(params, no_logging=True)
+        if not log_page:
+            break
+        # log_page is list of dicts, each dict:
+        #   {
+        #       'line':<int, line number>
+        #       'timestamp':<str, time in UTC>,
+        #       'message':<str, line of log output>,
+        #   }
+        # TODO 20190422: some of that info might be useful, return it?
+        yield [log_entry['message'] for log_entry in log_page]
+        line_start += len(log_page)
+
+
+def iter_log_lines(job_id, line_start=0):
+    """Yield each line of the job's log, starting at line_start.
+    """
+    for log_lines in iter_log_pages(job_id, line_start=line_start):
+        yield from log_lines
+
+
+def get_log_lines(job_id, line_start=0):
+    return list(iter_log_lines(job_id, line_start=line_start))
 
 
 def save_log(job_id, local_data_dir):
     """Write log file of job to directory local_data_dir / job_id / "log.txt"
     """
-    local_data_path = pathlib.Path(local_data_dir)
-    dest_path = local_data_path / job_id
-    dest_path.mkdir(parents=True, exist_ok=True)
+    dest_path = make_dirs(pathlib.Path(local_data_dir) / job_id)
     log_path = dest_path / 'log.txt'
-    log_lines = get_log_lines(job_id)
     with log_path.open('w') as log_fh:
-        for log_line in log_lines:
-            print(log_line, file=log_fh)
+        # one write per page
+        for log_lines in iter_log_pages(job_id):
+            log_fh.write("\n".join(log_lines) + "\n")
+
+
+def save_log_batch(job_ids, local_data_dir):
+    """save_log for each job in job_ids, JOB_FETCH_THREADS at a time.  Any
+        exception is re-raised after all jobs have finished.
+    """
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(JOB_FETCH_THREADS) as pool:
+        futures = [pool.submit(save_log, job_id, local_data_dir) for job_id in job_ids]
+    for future in futures:
+        future.result()
 
 
 def seconds_since_done(job_info):
     (finished_utc, _) = parse_jobinfo_dt(job_info['dtFinished'])
-    now_utc = datetime.datetime.now(datetime.timezone.utc)
+    now_utc = datetime.datetime.now(UTC)
     return (now_utc - finished_utc).total_seconds()
 
 
+def next_poll_sec(poll_sec=None, changed=True):
+    """Return how many seconds to wait before polling paperspace again.
+
+    Args:
+        poll_sec (float): the last interval waited, or None if first poll
+        changed (bool): whether the last poll saw anything new
+    """
+    try:
+        return max(1.0, float(os.environ[PSPACE_POLL_ENV_VAR]))
+    except (KeyError, ValueError):
+        pass
+    if poll_sec is None or changed:
+        return FOLLOW_POLL_MIN_SEC
+    return min(poll_sec * FOLLOW_POLL_BACKOFF, FOLLOW_POLL_MAX_SEC)
+
+
+def poll_sleep(poll_sec):
+    # jitter keeps several pspace processes from polling in lockstep
+    time.sleep(poll_sec + random.uniform(0, FOLLOW_POLL_JITTER_SEC))
+
+
 # TODO 20190422: one time this did not read or notice the PSEOF.  bug, but how?
 def follow_log(job_id, line_start=0):
     last_log_line = ""
+    poll_sec = next_poll_sec()
+    state_checked = None
+    done_deadline = None
     while last_log_line != "PSEOF":
-        job_info = get_job_info(job_id)
-        # TODO 20190509: one time the next job_done had KeyError about 'state'
-        #   need to redo job_info if error or empty?
-        if 'error' in job_info:
-            print("DEBUG: Error in job_info:")
-            print(job_info)
-        if job_done(job_id, job_info) and seconds_since_done(job_info) > 20:
+        # job state changes much less often than the log, so only ask for it
+        #   every FOLLOW_STATE_POLL_SEC instead of every log poll, and not at
+        #   all once the job is done
+        now = time.monotonic()
+        if done_deadline is None and (
+                state_checked is None or now - state_checked >= FOLLOW_STATE_POLL_SEC):
+            state_checked = now
+            job_info = get_job_info(job_id)
+            # TODO 20190509: one time the next job_done had KeyError about 'state'
+            #   need to redo job_info if error or empty?
+            if 'error' in job_info:
+                print("DEBUG: Error in job_info:")
+                print(job_info)
+            if job_done(job_id, job_info):
+                # keep reading the rest of the log until FOLLOW_DONE_WAIT_SEC
+                #   after the job finished
+                done_deadline = now + FOLLOW_DONE_WAIT_SEC - seconds_since_done(job_info)
+        if done_deadline is not None and now > done_deadline:
             break
 
-        time.sleep(5)
+        invalidate_job_info(job_id)
+        poll_sleep(poll_sec)
 
         log_lines = get_log_lines(job_id, line_start=line_start)
         line_start += len(log_lines)
         last_log_line = log_lines[-1] if log_lines else last_log_line
-        for line in log_lines:
-            print(line)
+
+        if log_lines:
+            # one write for the whole batch instead of one print per line
+            print("\n".join(log_lines), flush=True)
+        poll_sec = next_poll_sec(poll_sec, changed=bool(log_lines))
 
     return job_info
 
@@ -383,13 +601,17 @@ def follow_job_state(job_id):
     print("State: " + job_info['state'] + " "*10, end="", flush=True)
     if job_not_started(job_id, job_info):
         # waiting for job to start, updating state while we wait
+        poll_sec = next_poll_sec()
         while job_not_started(job_id, job_info):
-            time.sleep(5)
+            invalidate_job_info(job_id)
+            poll_sleep(poll_sec)
             last_state = job_info['state']
             job_info = get_job_info(job_id)
-            if job_info['state'] != last_state:
+            state_changed = job_info['state'] != last_state
+            if state_changed:
                 print("\r", end="", flush=True)
                 print("State: " + job_info['state'] + " "*10, end="", flush=True)
+            poll_sec = next_poll_sec(poll_sec, changed=state_changed)
     print("")
     return job_info
 
@@ -425,9 +647,15 @@ def print_last_log_lines(job_id, tail_lines=0, line_start=0, follow=False):
     #   in case we're not follow'ing
     if job_started(job_id, job_info):
         log_lines = get_log_lines(job_id, line_start=line_start)
+        if line_start > 0 and not log_lines:
+            # line_start came from a stale saved line count (there should be
+            #   at least the saved count of lines), so fetch the whole log
+            line_start = 0
+            log_lines = get_log_lines(job_id)
         total_log_lines = line_start + len(log_lines)
-        for line in log_lines[-tail_lines:]:
-            print(line)
+        # tail_lines of 0 gives all of log_lines
+        if log_lines:
+            print("\n".join(log_lines[-tail_lines:]), flush=True)
 
     last_log_line = log_lines[-1] if log_lines else ''
     if follow and last_log_line != "PSEOF":
@@ -440,13 +668,100 @@ def print_last_log_lines(job_id, tail_lines=0, line_start=0, follow=False):
 
 # yaml config -----------------------------------------------------------------
 
+def yaml_safe_load(yaml_fh):
+    """Same as yaml.safe_load, but uses the much faster libyaml C loader if
+        PyYAML was built with it.
+    """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(yaml_fh, Loader=loader)
+
+
+def yaml_safe_dump(data, yaml_fh=None):
+    """yaml.safe_dump with pspace's file formatting, using the libyaml C
+        dumper if PyYAML was built with it.  Returns the yaml str if yaml_fh
+        is None.
+    """
+    import yaml
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    return yaml.dump(data, yaml_fh, Dumper=dumper, width=70, indent=4, sort_keys=True)
+
+
+def _yaml_source_key(yaml_path):
+    """(absolute path, mtime_ns, size) of yaml_path, which together identify
+        one version of the file.
+
+    Raises:
+        IOError: if yaml_path doesn't exist
+    """
+    yaml_path = pathlib.Path(yaml_path)
+    yaml_stat = yaml_path.stat()
+    return (str(yaml_path.absolute()), yaml_stat.st_mtime_ns, yaml_stat.st_size)
+
+
+def _yaml_cache_path(yaml_path):
+    return PSPACE_INFO_PATH / (pathlib.Path(yaml_path).name + YAML_CACHE_SUFFIX)
+
+
+def _read_yaml_cache(yaml_path, source_key):
+    """Returns:
+        (cache_hit, data): cache_hit is True and data is the parsed contents
+            of yaml_path if the JSON cache is from this version of the file
+    """
+    try:
+        with _yaml_cache_path(yaml_path).open('r') as cache_fh:
+            cache = json.load(cache_fh)
+        if cache['source'] == list(source_key):
+            return (True, cache['data'])
+    except (IOError, ValueError, LookupError, TypeError):
+        pass
+    return (False, None)
+
+
+def _write_yaml_cache(yaml_path, source_key, data):
+    """Save data (parsed from yaml_path) as JSON, so the next process can skip
+        importing yaml and parsing.  Best effort, data that JSON can't hold
+        exactly (e.g. dates, non-string keys) is just not cached.
+    """
+    cache_str = json.dumps({'source': source_key, 'data': data}, default=repr)
+    if json.loads(cache_str)['data'] != data:
+        return
+    cache_path = _yaml_cache_path(yaml_path)
+    try:
+        make_dirs(cache_path.parent)
+        write_file_atomic(cache_path, cache_str)
+    except IOError:
+        pass
+
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml_file_cached(yaml_path, mtime_ns, size):
+    source_key = (yaml_path, mtime_ns, size)
+    (cache_hit, data) = _read_yaml_cache(yaml_path, source_key)
+    if not cache_hit:
+        with open(yaml_path, 'rb') as yaml_fh:
+            data = yaml_safe_load(yaml_fh)
+        _write_yaml_cache(yaml_path, source_key, data)
+    return data
+
+
+def load_yaml_file(yaml_path):
+    """Parse the yaml file at yaml_path.  Results are cached keyed on the
+        file's mtime and size, both in this process and as JSON in
+        PSPACE_INFO_DIR, so a file is only parsed again if it changed.
+        Callers must not modify the returned data.
+
+    Raises:
+        IOError: if yaml_path can't be read
+    """
+    return _load_yaml_file_cached(*_yaml_source_key(yaml_path))
+
+
 def get_yaml_cwd():
     yaml_config = None
-    for dir_path in YAML_CONFIG_SEARCH_PATHS_LOCAL:
-        yaml_config_file_path = dir_path / PSPACE_CONFIG_FILE
+    for yaml_config_file_path in YAML_CONFIG_FILE_PATHS:
         try:
-            with yaml_config_file_path.open('r') as yaml_fh:
-                yaml_config = yaml.safe_load(yaml_fh)
+            yaml_config = load_yaml_file(yaml_config_file_path)
         except IOError:
             pass
         else:
@@ -455,17 +770,16 @@ def get_yaml_cwd():
 
 
 def save_new_yaml_config():
-    yaml_path = pathlib.Path('pspace.yaml')
-    if yaml_path.exists():
-        yaml_path.rename('pspace.yaml.bak')
     # second item in dict value list is for newyaml
-    newyaml_defaults = copy.copy(CMD_ARG_DEFAULTS)
-    for cmd_def in newyaml_defaults:
-        for opt in newyaml_defaults[cmd_def]:
-            newyaml_defaults[cmd_def][opt] = newyaml_defaults[cmd_def][opt][1]
+    newyaml_defaults = {
+            cmd_def: {opt: opt_defaults[1] for (opt, opt_defaults) in cmd_defaults.items()}
+            for (cmd_def, cmd_defaults) in CMD_ARG_DEFAULTS.items()
+            }
 
-    with yaml_path.open('w') as yaml_fh:
-        yaml.dump(CMD_ARG_DEFAULTS, yaml_fh, width=70, indent=4, sort_keys=True)
+    write_file_atomic(
+            PSPACE_CONFIG_FILE, yaml_safe_dump(newyaml_defaults),
+            backup_path=PSPACE_CONFIG_FILE + '.bak'
+            )
 
 
 def get_yaml_config(subcommand):
@@ -481,10 +795,10 @@ def get_yaml_config(subcommand):
 
 # pspace info ----------------------------------------------------------------
 
-# TODO 20190422: We probably don't need to save all job info.
-# really the only things we use are very few:
+# We don't need to save all job info, really the only things we use are very
+#   few:
 #   last job ID
-#   last total log lines for a job ID
+#   last total log lines for a job ID (passed in via extra_info)
 
 def save_last_info(job_info, extra_info=None):
     # only save .pspace/ if pspace.yaml in cwd,
@@ -495,28 +809,29 @@ def save_last_info(job_info, extra_info=None):
     if extra_info is None:
         extra_info = {}
 
-    pspace_info_path = pathlib.Path('.') / PSPACE_INFO_DIR
-    pspace_info_path.mkdir(exist_ok=True)
-    pspace_job_info_path = pspace_info_path / PSPACE_LASTINFO_FILE
+    make_dirs(PSPACE_INFO_PATH)
 
-    job_info = {x:job_info[x] for x in job_info if job_info[x] is not None}
+    saved_job_info = {
+            key:job_info[key] for key in LASTINFO_JOB_KEYS
+            if job_info.get(key, None) is not None
+            }
     pspace_info = {'info_updated': str(datetime.datetime.now())}
     pspace_info.update(extra_info)
 
-    info = {'job_info': job_info, 'pspace_info': pspace_info}
+    info = {'job_info': saved_job_info, 'pspace_info': pspace_info}
 
-    with pspace_job_info_path.open('w') as pspace_job_info_fh:
-        yaml.dump(info, pspace_job_info_fh, width=70, indent=4, sort_keys=True)
+    write_file_atomic(PSPACE_LASTINFO_PATH, yaml_safe_dump(info))
+    # we already have the data, so save the cache now instead of on next read
+    _write_yaml_cache(
+            PSPACE_LASTINFO_PATH, _yaml_source_key(PSPACE_LASTINFO_PATH), info
+            )
 
 
 def get_last_info():
     info = {}
 
-    pspace_info_path = pathlib.Path('.') / PSPACE_INFO_DIR
-    pspace_job_info_path = pspace_info_path / PSPACE_LASTINFO_FILE
     try:
-        with pspace_job_info_path.open('r') as pspace_job_info_fh:
-            info = yaml.safe_load(pspace_job_info_fh)
+        info = load_yaml_file(PSPACE_LASTINFO_PATH)
     except IOError:
         #print("Can't find pspace info for last job.")
         info = {}